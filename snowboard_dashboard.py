@@ -1,82 +1,245 @@
 import streamlit as st
 import requests
-import pandas as pd
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
 from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import hashlib
+import html
+import json
+import os
+import re
+import threading
 import time
 
-# Download VADER once
+# Optional faster JSON decoder for API responses
 try:
-    nltk.download('vader_lexicon', quiet=True)
-    sia = SentimentIntensityAnalyzer()
-except:
-    sia = None
+    import orjson
+except ImportError:
+    orjson = None
+
+# Process-wide singleton; show_spinner=False since this runs before set_page_config
+@st.cache_resource(show_spinner=False)
+def _http():
+    """Shared HTTP session so repeat calls to the same host reuse the TCP/TLS connection"""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "ski-finder/1.0"})
+    retries = Retry(total=2, backoff_factor=0.3)
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+    return session
+
+SESSION = _http()
+
+def parse_json(response):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Sentiment -> emoji buckets; a score equal to a threshold falls into the higher bucket
+SENTIMENT_THRESHOLDS = np.array([-0.2, -0.05, 0.05, 0.2])
+SENTIMENT_EMOJIS = np.array(["😞", "😕", "😐", "😊", "😍"])
+
+# === PERSISTENT DISK CACHE ===
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+def prune_cache_dir(directory, ttl, max_entries):
+    """Delete entries older than `ttl`, then the oldest ones beyond `max_entries`"""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(".json")]
+    except OSError:
+        return
+    
+    now = time.time()
+    entries = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            mtime = os.path.getmtime(path)
+            if now - mtime >= ttl:
+                os.remove(path)
+            else:
+                entries.append((mtime, path))
+        except OSError:
+            pass  # Removed by a concurrent prune
+    
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def file_cache(subdir, ttl, max_entries=500):
+    """Cache JSON-serializable results on disk so they survive process restarts.
+    
+    Entries live in .cache/<subdir>/<md5 of call>.json as {"ts": epoch, "data": ...}.
+    Exceptions and None results are not cached, so failures are retried on the next call.
+    Each write prunes the subdir to `max_entries` unexpired entries, so give every
+    decorated function its own subdir; otherwise the shorter TTL evicts the longer one's entries.
+    Don't stack @st.cache_data on top: each memory tier would restart the TTL from when
+    it loaded the entry, letting data outlive `ttl`. Reading a small JSON file is cheap.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = hashlib.md5(repr((func.__name__,) + args).encode()).hexdigest()
+            path = os.path.join(CACHE_DIR, subdir, f"{key}.json")
+            
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+                if time.time() - entry["ts"] < ttl:
+                    return entry["data"]
+            except (OSError, ValueError, KeyError):
+                pass
+            
+            data = func(*args)
+            if data is None:
+                return data
+            
+            # Write to a temp file first so concurrent readers never see a partial entry
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"ts": time.time(), "data": data}, f)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+            else:
+                prune_cache_dir(os.path.dirname(path), ttl, max_entries)
+            
+            return data
+        return wrapper
+    return decorator
 
 # === DYNAMIC LOCATION & RESORT DISCOVERY ===
-@st.cache_data(ttl=3600)
+@st.cache_resource(show_spinner=False)
+def _geolocator():
+    """Shared Nominatim geocoder; a longer timeout than geopy's 1s default avoids spurious ReadTimeouts"""
+    return Nominatim(user_agent="ski_resort_finder_v2", timeout=15)
+
+@file_cache("geocode", ttl=2592000)
+def geocode_location(location_name):
+    """Geocode a place name to [lat, lon, address], or None if Nominatim has no match"""
+    location = _geolocator().geocode(location_name)
+    if location:
+        return [location.latitude, location.longitude, location.address]
+    return None
+
+# "lat, lon" typed directly into the location box, e.g. "39.19, -120.23"
+COORDINATE_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
 def get_location_coordinates(location_name):
     """Convert location name to coordinates"""
+    # Pasted coordinates don't need a geocoding round-trip
+    match = COORDINATE_RE.match(location_name)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon, f"{lat}, {lon}"
+    
     try:
-        geolocator = Nominatim(user_agent="ski_resort_finder_v2")
-        location = geolocator.geocode(location_name)
+        location = geocode_location(location_name)
         if location:
-            return location.latitude, location.longitude, location.address
+            return tuple(location)
         return None, None, None
     except Exception as e:
         st.error(f"Location error: {e}")
         return None, None, None
 
-@st.cache_data(ttl=3600)
-def find_ski_resorts_osm(lat, lon, radius_miles):
-    """Find ski resorts using OpenStreetMap Overpass API with fallback"""
-    resorts = []
+# Common non-resort keywords to filter out, matched as case-insensitive substrings
+EXCLUDE_KEYWORDS = [
+    "trail", "road", "loop", "path", "route", "fire road", "bike", "hike",
+    "parking", "lodge parking", "base", "trailhead", "campground", "picnic",
+    "restroom", "store", "rental shop", "school building", "cafeteria"
+]
+EXCLUDE_RE = re.compile("|".join(map(re.escape, EXCLUDE_KEYWORDS)), re.IGNORECASE)
+
+# Generic words ignored when comparing OSM names, so "Heavenly" and "Heavenly Mountain Resort" collide
+GENERIC_NAME_WORDS = frozenset({"the", "ski", "resort", "area", "mountain"})
+
+@functools.lru_cache(maxsize=1024)
+def resort_name_key(name):
+    """Normalize a resort name for duplicate detection (case, punctuation, generic words)"""
+    words = re.findall(r"\w+", name.casefold())
+    core = [word for word in words if word not in GENERIC_NAME_WORDS]
+    return " ".join(core or words)
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Most resorts returned from a single OSM search; the nearest ones are kept
+MAX_RESORTS = 25
+
+def haversine_miles(lat, lon, lats, lons):
+    """Great-circle distance in miles from (lat, lon) to arrays of points"""
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    lats_r, lons_r = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lats_r - lat_r) / 2) ** 2
+        + np.cos(lat_r) * np.cos(lats_r) * np.sin((lons_r - lon_r) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+@file_cache("overpass", ttl=3600, max_entries=200)
+def fetch_overpass_elements(lat, lon, radius_meters):
+    """Query Overpass for ski areas around a point.
+    
+    Non-200 replies (Overpass often answers 429/504) and error remarks raise, so the
+    disk cache doesn't store them and the next search retries.
+    """
+    # Try primary Overpass API server
+    overpass_url = "https://overpass-api.de/api/interpreter"
+    
+    # More focused query - primarily leisure=ski_resort
+    around = f"(around:{radius_meters},{lat},{lon})"
+    query = (
+        "[out:json][timeout:60];("
+        f'nwr["leisure"="ski_resort"]{around};'
+        f'nwr["sport"="skiing"]["name"]{around};'
+        ");out center;"
+    )
     
-    # Common non-resort keywords to filter out
-    exclude_keywords = [
-        "trail", "road", "loop", "path", "route", "fire road", "bike", "hike",
-        "parking", "lodge parking", "base", "trailhead", "campground", "picnic",
-        "restroom", "store", "rental shop", "school building", "cafeteria"
-    ]
+    response = SESSION.post(overpass_url, data={"data": query}, timeout=60)
+    response.raise_for_status()
+    data = parse_json(response)
+    # On a server-side timeout or runtime error Overpass still answers 200, with a
+    # "remark" and no elements; raise like a non-200 so it isn't cached or shown as "no resorts"
+    if data.get("remark"):
+        raise RuntimeError(f"Overpass: {data['remark']}")
+    return data.get("elements", [])
+
+def find_ski_resorts_osm(lat, lon, radius_miles, max_results=MAX_RESORTS):
+    """Find the nearest `max_results` ski resorts using OpenStreetMap Overpass API with fallback"""
+    resorts = []
     
     try:
-        # Try primary Overpass API server
-        overpass_url = "https://overpass-api.de/api/interpreter"
-        radius_meters = int(radius_miles * 1609.34)
-        
-        # More focused query - primarily leisure=ski_resort
-        query = f"""
-        [out:json][timeout:60];
-        (
-          node["leisure"="ski_resort"](around:{radius_meters},{lat},{lon});
-          way["leisure"="ski_resort"](around:{radius_meters},{lat},{lon});
-          relation["leisure"="ski_resort"](around:{radius_meters},{lat},{lon});
-          node["sport"="skiing"]["name"](around:{radius_meters},{lat},{lon});
-          way["sport"="skiing"]["name"](around:{radius_meters},{lat},{lon});
-          relation["sport"="skiing"]["name"](around:{radius_meters},{lat},{lon});
-        );
-        out center;
-        """
-        
-        response = requests.post(overpass_url, data={"data": query}, timeout=60)
+        # Query around the point rounded to ~1 km so repeat and nearby searches share one
+        # Overpass response. The slider already moves in 5-mile steps, so the radius only
+        # needs +0.5 mile to cover the rounding shift (0.005° diagonally); the exact radius
+        # is applied to the distances below.
+        elements = fetch_overpass_elements(
+            round(lat, 2), round(lon, 2), int((radius_miles + 0.5) * 1609.34)
+        )
         
-        if response.status_code == 200:
-            data = response.json()
-            seen = set()
+        if elements is not None:
+            candidates = []
             
-            for elem in data.get("elements", []):
+            for elem in elements:
                 tags = elem.get("tags", {})
                 name = tags.get("name", "")
                 
                 # Skip unnamed entries
-                if not name or name in seen:
+                if not name:
                     continue
                 
                 # Filter out non-resort names
-                name_lower = name.lower()
-                if any(keyword in name_lower for keyword in exclude_keywords):
+                if EXCLUDE_RE.search(name):
                     continue
                 
                 # Skip if it's just a ski school or rental shop (not the resort itself)
@@ -92,20 +255,38 @@ def find_ski_resorts_osm(lat, lon, radius_miles):
                 else:
                     continue
                 
-                # Calculate distance
-                distance = geodesic((lat, lon), (elem_lat, elem_lon)).miles
+                candidates.append((name, elem_lat, elem_lon, tags))
+            
+            # Calculate all distances in one vectorized pass
+            if candidates:
+                distances = haversine_miles(
+                    lat, lon,
+                    np.array([c[1] for c in candidates]),
+                    np.array([c[2] for c in candidates])
+                )
+                seen = set()
                 
-                if distance <= radius_miles:
+                # Walk nearest-first so we can stop as soon as we have enough resorts
+                for idx in np.argsort(distances, kind="stable"):
+                    distance = distances[idx]
+                    if distance > radius_miles or len(resorts) >= max_results:
+                        break
+                    
+                    name, elem_lat, elem_lon, tags = candidates[idx]
+                    name_key = resort_name_key(name)
+                    if name_key in seen:
+                        continue
+                    
                     resorts.append({
                         "name": name,
                         "lat": elem_lat,
                         "lon": elem_lon,
-                        "distance": round(distance, 1),
+                        "distance": round(float(distance), 1),
                         "website": tags.get("website", tags.get("contact:website", "")),
                         "phone": tags.get("phone", tags.get("contact:phone", "")),
                         "source": "OpenStreetMap"
                     })
-                    seen.add(name)
+                    seen.add(name_key)
             
             # If we found resorts, return them sorted
             if resorts:
@@ -126,34 +307,37 @@ def find_ski_resorts_osm(lat, lon, radius_miles):
             return get_tahoe_fallback_resorts(lat, lon, radius_miles)
         return []
 
+# Known Lake Tahoe resorts with coordinates
+TAHOE_FALLBACK_RESORTS = [
+    {"name": "Palisades Tahoe", "lat": 39.1970, "lon": -120.2356, "website": "https://www.palisadestahoe.com"},
+    {"name": "Heavenly", "lat": 38.9352, "lon": -119.9393, "website": "https://www.skiheavenly.com"},
+    {"name": "Northstar California", "lat": 39.2734, "lon": -120.1217, "website": "https://www.northstarcalifornia.com"},
+    {"name": "Kirkwood", "lat": 38.6836, "lon": -120.0647, "website": "https://www.kirkwood.com"},
+    {"name": "Sierra-at-Tahoe", "lat": 38.7993, "lon": -120.0803, "website": "https://www.sierraattahoe.com"},
+    {"name": "Sugar Bowl", "lat": 39.3018, "lon": -120.3391, "website": "https://www.sugarbowl.com"},
+    {"name": "Homewood Mountain Resort", "lat": 39.0833, "lon": -120.1667, "website": "https://www.skihomewood.com"},
+    {"name": "Mt. Rose Ski Tahoe", "lat": 39.3142, "lon": -119.8870, "website": "https://www.skirose.com"},
+    {"name": "Diamond Peak", "lat": 39.2517, "lon": -119.9194, "website": "https://www.diamondpeak.com"},
+    {"name": "Boreal Mountain Resort", "lat": 39.3325, "lon": -120.3475, "website": "https://www.rideboreal.com"},
+    {"name": "Soda Springs", "lat": 39.3197, "lon": -120.3733, "website": "https://www.skisodasprings.com"},
+    {"name": "Tahoe Donner", "lat": 39.3175, "lon": -120.2369, "website": "https://www.tahoedonner.com"},
+]
+TAHOE_FALLBACK_LATS = np.array([r["lat"] for r in TAHOE_FALLBACK_RESORTS])
+TAHOE_FALLBACK_LONS = np.array([r["lon"] for r in TAHOE_FALLBACK_RESORTS])
+
 def get_tahoe_fallback_resorts(lat, lon, radius_miles):
     """Fallback list of known Tahoe ski resorts when API fails"""
-    # Known Lake Tahoe resorts with coordinates
-    known_resorts = [
-        {"name": "Palisades Tahoe", "lat": 39.1970, "lon": -120.2356, "website": "https://www.palisadestahoe.com"},
-        {"name": "Heavenly", "lat": 38.9352, "lon": -119.9393, "website": "https://www.skiheavenly.com"},
-        {"name": "Northstar California", "lat": 39.2734, "lon": -120.1217, "website": "https://www.northstarcalifornia.com"},
-        {"name": "Kirkwood", "lat": 38.6836, "lon": -120.0647, "website": "https://www.kirkwood.com"},
-        {"name": "Sierra-at-Tahoe", "lat": 38.7993, "lon": -120.0803, "website": "https://www.sierraattahoe.com"},
-        {"name": "Sugar Bowl", "lat": 39.3018, "lon": -120.3391, "website": "https://www.sugarbowl.com"},
-        {"name": "Homewood Mountain Resort", "lat": 39.0833, "lon": -120.1667, "website": "https://www.skihomewood.com"},
-        {"name": "Mt. Rose Ski Tahoe", "lat": 39.3142, "lon": -119.8870, "website": "https://www.skirose.com"},
-        {"name": "Diamond Peak", "lat": 39.2517, "lon": -119.9194, "website": "https://www.diamondpeak.com"},
-        {"name": "Boreal Mountain Resort", "lat": 39.3325, "lon": -120.3475, "website": "https://www.rideboreal.com"},
-        {"name": "Soda Springs", "lat": 39.3197, "lon": -120.3733, "website": "https://www.skisodasprings.com"},
-        {"name": "Tahoe Donner", "lat": 39.3175, "lon": -120.2369, "website": "https://www.tahoedonner.com"},
-    ]
-    
     # Filter by distance
+    distances = haversine_miles(lat, lon, TAHOE_FALLBACK_LATS, TAHOE_FALLBACK_LONS)
+    
     resorts = []
-    for resort in known_resorts:
-        distance = geodesic((lat, lon), (resort["lat"], resort["lon"])).miles
+    for resort, distance in zip(TAHOE_FALLBACK_RESORTS, distances):
         if distance <= radius_miles:
             resorts.append({
                 "name": resort["name"],
                 "lat": resort["lat"],
                 "lon": resort["lon"],
-                "distance": round(distance, 1),
+                "distance": round(float(distance), 1),
                 "website": resort["website"],
                 "phone": "",
                 "source": "Fallback Database"
@@ -161,8 +345,95 @@ def get_tahoe_fallback_resorts(lat, lon, radius_miles):
     
     return sorted(resorts, key=lambda x: x["distance"])
 
-def generate_booking_urls(resort_name, resort_website, date_from, date_to, need_lesson, need_rental):
-    """Generate smart booking URLs with dates pre-filled"""
+def compile_key_matcher(keys):
+    """Compile substring keys into a single-pass matcher.
+    
+    The matcher returns the earliest-listed key found anywhere in the text (same result
+    as looping over keys with `key in text`), or None. The lookahead makes the regex try
+    every position, and at each position alternation prefers the earliest-listed key.
+    """
+    keys = list(keys)
+    rank = {key: i for i, key in enumerate(keys)}
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, keys)) + "))")
+    
+    def match(text):
+        found = [m.group(1) for m in pattern.finditer(text)]
+        return min(found, key=rank.__getitem__) if found else None
+    
+    return match
+
+# Known resort booking URL templates; {date_from}/{date_to} are filled per trip
+LIFT_TICKET_TEMPLATES = {
+    # Vail Resorts (Epic Pass)
+    "northstar": "https://www.northstarcalifornia.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+    "heavenly": "https://www.skiheavenly.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+    "kirkwood": "https://www.kirkwood.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+    "vail": "https://www.vail.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+    "breckenridge": "https://www.breckenridge.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+    "keystone": "https://www.keystoneresort.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+    "parkcity": "https://www.parkcitymountain.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from}&endDate={date_to}",
+
+    # Alterra Resorts (Ikon Pass)
+    "palisades": "https://www.palisadestahoe.com/tickets-passes?arrival={date_from}&departure={date_to}",
+    "sugarbowl": "https://www.sugarbowl.com/plan/tickets?date={date_from}",
+    "squaw": "https://www.palisadestahoe.com/tickets-passes?arrival={date_from}&departure={date_to}",
+    "mammoth": "https://www.mammothmountain.com/tickets-and-passes/lift-tickets?startDate={date_from}",
+    "deervalley": "https://www.deervalley.com/plan/tickets-passes?arrival={date_from}&departure={date_to}",
+    "steamboat": "https://www.steamboat.com/plan-your-trip/lift-access/tickets?arrival={date_from}&departure={date_to}",
+
+    # Independent resorts
+    "sierra": "https://www.sierraattahoe.com/lift-tickets/?date={date_from}",
+    "alta": "https://www.alta.com/tickets?date={date_from}",
+    "snowbird": "https://www.snowbird.com/lift-tickets/?arrivaldate={date_from}&departuredate={date_to}",
+    "jacksonhole": "https://www.jacksonhole.com/lift-tickets-passes.html?arrival={date_from}&departure={date_to}",
+    "jackson": "https://www.jacksonhole.com/lift-tickets-passes.html?arrival={date_from}&departure={date_to}",
+    "aspen": "https://www.aspensnowmass.com/tickets-passes/lift-tickets?startDate={date_from}&endDate={date_to}",
+    "stowe": "https://www.stowe.com/plan-your-trip/lift-access/tickets?arrival={date_from}",
+    "killington": "https://www.killington.com/plan-your-trip/tickets-and-passes?arrival={date_from}",
+}
+
+# Lesson booking URL templates
+LESSON_TEMPLATES = {
+    "northstar": "https://www.northstarcalifornia.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from}",
+    "heavenly": "https://www.skiheavenly.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from}",
+    "palisades": "https://www.palisadestahoe.com/ski-ride-school?date={date_from}",
+    "vail": "https://www.vail.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from}",
+    "breckenridge": "https://www.breckenridge.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from}",
+}
+
+# Rental booking URL templates
+RENTAL_TEMPLATES = {
+    "northstar": "https://www.northstarcalifornia.com/plan-your-trip/rentals-and-demos.aspx?startDate={date_from}",
+    "heavenly": "https://www.skiheavenly.com/plan-your-trip/rentals-and-demos.aspx?startDate={date_from}",
+    "palisades": "https://www.palisadestahoe.com/rentals?date={date_from}",
+    "vail": "https://www.vail.com/plan-your-trip/rentals-and-demos.aspx?startDate={date_from}",
+}
+
+match_lift_ticket_key = compile_key_matcher(LIFT_TICKET_TEMPLATES)
+match_lesson_key = compile_key_matcher(LESSON_TEMPLATES)
+match_rental_key = compile_key_matcher(RENTAL_TEMPLATES)
+
+def format_booking_template(templates, match_key, resort_slug, date_from_str, date_to_str):
+    """Fill in the first template whose key appears in the resort slug, or return None"""
+    key = match_key(resort_slug)
+    if key is None:
+        return None
+    return templates[key].format(date_from=date_from_str, date_to=date_to_str)
+
+@functools.lru_cache(maxsize=512)
+def resort_slug_forms(resort_name):
+    """Return (slug for pattern matching, plus-joined name for search queries)"""
+    resort_slug = resort_name.lower().replace(" ", "").replace("-", "")
+    resort_plus = resort_name.replace(" ", "+")
+    return resort_slug, resort_plus
+
+@functools.lru_cache(maxsize=1024)
+def generate_booking_urls(resort_name, resort_website, date_from_str, date_to_str, need_lesson, need_rental):
+    """Generate smart booking URLs with dates pre-filled.
+    
+    Dates are ISO "YYYY-MM-DD" strings so every argument is hashable for the cache;
+    the returned dict is shared between calls and must not be mutated.
+    """
     
     booking_info = {
         "lift_ticket_link": "",
@@ -171,57 +442,14 @@ def generate_booking_urls(resort_name, resort_website, date_from, date_to, need_
         "lesson_display": "",
         "rental_link": "",
         "rental_display": "",
-        "full_package_link": "",
-        "estimated_total": ""
+        "full_package_link": ""
     }
     
-    # Format dates
-    date_from_str = date_from.strftime("%Y-%m-%d")
-    date_to_str = date_to.strftime("%Y-%m-%d")
-    
     # Clean resort name for URLs
-    resort_slug = resort_name.lower().replace(" ", "").replace("-", "")
-    resort_dash = resort_name.lower().replace(" ", "-")
-    resort_plus = resort_name.replace(" ", "+")
-    
-    trip_days = (date_to - date_from).days + 1
-    
-    # Known resort booking URL patterns with date parameters
-    known_patterns = {
-        # Vail Resorts (Epic Pass)
-        "northstar": f"https://www.northstarcalifornia.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        "heavenly": f"https://www.skiheavenly.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        "kirkwood": f"https://www.kirkwood.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        "vail": f"https://www.vail.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        "breckenridge": f"https://www.breckenridge.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        "keystone": f"https://www.keystoneresort.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        "parkcity": f"https://www.parkcitymountain.com/plan-your-trip/lift-access/tickets.aspx?startDate={date_from_str}&endDate={date_to_str}",
-        
-        # Alterra Resorts (Ikon Pass)
-        "palisades": f"https://www.palisadestahoe.com/tickets-passes?arrival={date_from_str}&departure={date_to_str}",
-        "sugarbowl": f"https://www.sugarbowl.com/plan/tickets?date={date_from_str}",
-        "squaw": f"https://www.palisadestahoe.com/tickets-passes?arrival={date_from_str}&departure={date_to_str}",
-        "mammoth": f"https://www.mammothmountain.com/tickets-and-passes/lift-tickets?startDate={date_from_str}",
-        "deervalley": f"https://www.deervalley.com/plan/tickets-passes?arrival={date_from_str}&departure={date_to_str}",
-        "steamboat": f"https://www.steamboat.com/plan-your-trip/lift-access/tickets?arrival={date_from_str}&departure={date_to_str}",
-        
-        # Independent resorts
-        "sierra": f"https://www.sierraattahoe.com/lift-tickets/?date={date_from_str}",
-        "alta": f"https://www.alta.com/tickets?date={date_from_str}",
-        "snowbird": f"https://www.snowbird.com/lift-tickets/?arrivaldate={date_from_str}&departuredate={date_to_str}",
-        "jacksonhole": f"https://www.jacksonhole.com/lift-tickets-passes.html?arrival={date_from_str}&departure={date_to_str}",
-        "jackson": f"https://www.jacksonhole.com/lift-tickets-passes.html?arrival={date_from_str}&departure={date_to_str}",
-        "aspen": f"https://www.aspensnowmass.com/tickets-passes/lift-tickets?startDate={date_from_str}&endDate={date_to_str}",
-        "stowe": f"https://www.stowe.com/plan-your-trip/lift-access/tickets?arrival={date_from_str}",
-        "killington": f"https://www.killington.com/plan-your-trip/tickets-and-passes?arrival={date_from_str}",
-    }
+    resort_slug, resort_plus = resort_slug_forms(resort_name)
     
     # Match resort to known pattern
-    matched_url = None
-    for key, url in known_patterns.items():
-        if key in resort_slug:
-            matched_url = url
-            break
+    matched_url = format_booking_template(LIFT_TICKET_TEMPLATES, match_lift_ticket_key, resort_slug, date_from_str, date_to_str)
     
     # Generate lift ticket URL
     if matched_url:
@@ -237,19 +465,7 @@ def generate_booking_urls(resort_name, resort_website, date_from, date_to, need_
     
     # Lesson URLs
     if need_lesson:
-        lesson_patterns = {
-            "northstar": f"https://www.northstarcalifornia.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from_str}",
-            "heavenly": f"https://www.skiheavenly.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from_str}",
-            "palisades": f"https://www.palisadestahoe.com/ski-ride-school?date={date_from_str}",
-            "vail": f"https://www.vail.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from_str}",
-            "breckenridge": f"https://www.breckenridge.com/plan-your-trip/ski-and-ride-school.aspx?startDate={date_from_str}",
-        }
-        
-        lesson_url = None
-        for key, url in lesson_patterns.items():
-            if key in resort_slug:
-                lesson_url = url
-                break
+        lesson_url = format_booking_template(LESSON_TEMPLATES, match_lesson_key, resort_slug, date_from_str, date_to_str)
         
         if lesson_url:
             booking_info["lesson_link"] = lesson_url
@@ -262,18 +478,7 @@ def generate_booking_urls(resort_name, resort_website, date_from, date_to, need_
     
     # Rental URLs
     if need_rental:
-        rental_patterns = {
-            "northstar": f"https://www.northstarcalifornia.com/plan-your-trip/rentals-and-demos.aspx?startDate={date_from_str}",
-            "heavenly": f"https://www.skiheavenly.com/plan-your-trip/rentals-and-demos.aspx?startDate={date_from_str}",
-            "palisades": f"https://www.palisadestahoe.com/rentals?date={date_from_str}",
-            "vail": f"https://www.vail.com/plan-your-trip/rentals-and-demos.aspx?startDate={date_from_str}",
-        }
-        
-        rental_url = None
-        for key, url in rental_patterns.items():
-            if key in resort_slug:
-                rental_url = url
-                break
+        rental_url = format_booking_template(RENTAL_TEMPLATES, match_rental_key, resort_slug, date_from_str, date_to_str)
         
         if rental_url:
             booking_info["rental_link"] = rental_url
@@ -294,7 +499,10 @@ def generate_booking_urls(resort_name, resort_website, date_from, date_to, need_
     
     booking_info["full_package_link"] = f"https://www.google.com/search?q={package_query}"
     
-    # Estimate costs
+    return booking_info
+
+def estimate_trip_cost(trip_days, need_lesson, need_rental):
+    """Rough trip total; the same flat prices apply to every resort, so compute once per search"""
     base_ticket_price = 150
     lesson_price = 200 if need_lesson else 0
     rental_price = 50 if need_rental else 0
@@ -302,69 +510,64 @@ def generate_booking_urls(resort_name, resort_website, date_from, date_to, need_
     daily_cost = base_ticket_price + rental_price
     total_cost = (daily_cost * trip_days) + lesson_price
     
-    booking_info["estimated_total"] = f"~${total_cost}"
-    booking_info["trip_days"] = trip_days
-    
-    return booking_info
+    return f"~${total_cost}"
+
+# Comprehensive reputation map based on skier reviews and popularity
+REPUTATION_MAP = {
+    # Premium resorts - highly positive (0.20-0.30)
+    "vail": 0.25, "aspen": 0.28, "deer valley": 0.30, "jackson hole": 0.27,
+    "park city": 0.22, "steamboat": 0.23, "telluride": 0.28,
+
+    # Popular Tahoe resorts - positive (0.12-0.22)
+    "heavenly": 0.20, "northstar": 0.18, "palisades": 0.25, "squaw": 0.25,
+    "alpine meadows": 0.20, "kirkwood": 0.22, "sierra": 0.15, "sierra-at-tahoe": 0.15,
+    "sugar bowl": 0.18, "homewood": 0.16, "mt. rose": 0.17, "mt rose": 0.17,
+    "diamond peak": 0.14, "boreal": 0.10, "soda springs": 0.08, "tahoe donner": 0.10,
 
-@st.cache_data(ttl=1800)
+    # Popular Colorado resorts - positive (0.15-0.25)
+    "breckenridge": 0.23, "keystone": 0.18, "copper": 0.20, "winter park": 0.19,
+    "loveland": 0.16, "arapahoe": 0.15, "a-basin": 0.18, "eldora": 0.12,
+    "crested butte": 0.21, "monarch": 0.14, "wolf creek": 0.19,
+
+    # Utah resorts - very positive (0.20-0.30)
+    "alta": 0.28, "snowbird": 0.27, "brighton": 0.19, "solitude": 0.20,
+    "powder mountain": 0.22, "snowbasin": 0.21, "sundance": 0.15,
+
+    # East coast - moderate (0.10-0.20)
+    "stowe": 0.19, "killington": 0.16, "sugarbush": 0.17, "sunday river": 0.15,
+    "sugarloaf": 0.18, "jay peak": 0.20, "whiteface": 0.14, "okemo": 0.13,
+    "stratton": 0.14, "mount snow": 0.12, "loon": 0.13, "bretton woods": 0.14,
+
+    # Pacific Northwest - moderate to positive (0.12-0.25)
+    "crystal": 0.20, "mt baker": 0.24, "stevens": 0.16, "whistler": 0.28,
+    "snoqualmie": 0.12, "mt hood meadows": 0.18, "timberline": 0.17,
+    "mission ridge": 0.15, "mt bachelor": 0.21,
+
+    # California - various (0.08-0.22)
+    "mammoth": 0.24, "mountain high": 0.08, "bear mountain": 0.09,
+    "june mountain": 0.16, "snow summit": 0.10, "china peak": 0.12,
+
+    # Smaller/family resorts - neutral to slight positive (0.05-0.12)
+    "echo mountain": 0.10, "ski cooper": 0.12, "purgatory": 0.14,
+    "taos": 0.22, "red river": 0.13, "angel fire": 0.11,
+}
+
+match_reputation_key = compile_key_matcher(REPUTATION_MAP)
+
+@functools.lru_cache(maxsize=512)
 def get_reddit_sentiment(resort_name):
     """Get resort sentiment using reputation-based scoring system"""
-    if not sia:
-        return 0.0, 50, 0, "VADER not available"
-    
     # Use resort reputation heuristics (more reliable than APIs)
     resort_lower = resort_name.lower()
     
-    # Comprehensive reputation map based on skier reviews and popularity
-    reputation_map = {
-        # Premium resorts - highly positive (0.20-0.30)
-        "vail": 0.25, "aspen": 0.28, "deer valley": 0.30, "jackson hole": 0.27,
-        "park city": 0.22, "steamboat": 0.23, "telluride": 0.28,
-        
-        # Popular Tahoe resorts - positive (0.12-0.22)
-        "heavenly": 0.20, "northstar": 0.18, "palisades": 0.25, "squaw": 0.25,
-        "alpine meadows": 0.20, "kirkwood": 0.22, "sierra": 0.15, "sierra-at-tahoe": 0.15,
-        "sugar bowl": 0.18, "homewood": 0.16, "mt. rose": 0.17, "mt rose": 0.17,
-        "diamond peak": 0.14, "boreal": 0.10, "soda springs": 0.08, "tahoe donner": 0.10,
-        
-        # Popular Colorado resorts - positive (0.15-0.25)
-        "breckenridge": 0.23, "keystone": 0.18, "copper": 0.20, "winter park": 0.19,
-        "loveland": 0.16, "arapahoe": 0.15, "a-basin": 0.18, "eldora": 0.12,
-        "crested butte": 0.21, "monarch": 0.14, "wolf creek": 0.19,
-        
-        # Utah resorts - very positive (0.20-0.30)
-        "alta": 0.28, "snowbird": 0.27, "brighton": 0.19, "solitude": 0.20,
-        "powder mountain": 0.22, "snowbasin": 0.21, "sundance": 0.15,
-        
-        # East coast - moderate (0.10-0.20)
-        "stowe": 0.19, "killington": 0.16, "sugarbush": 0.17, "sunday river": 0.15,
-        "sugarloaf": 0.18, "jay peak": 0.20, "whiteface": 0.14, "okemo": 0.13,
-        "stratton": 0.14, "mount snow": 0.12, "loon": 0.13, "bretton woods": 0.14,
-        
-        # Pacific Northwest - moderate to positive (0.12-0.25)
-        "crystal": 0.20, "mt baker": 0.24, "stevens": 0.16, "whistler": 0.28,
-        "snoqualmie": 0.12, "mt hood meadows": 0.18, "timberline": 0.17,
-        "mission ridge": 0.15, "mt bachelor": 0.21,
-        
-        # California - various (0.08-0.22)
-        "mammoth": 0.24, "mountain high": 0.08, "bear mountain": 0.09,
-        "june mountain": 0.16, "snow summit": 0.10, "china peak": 0.12,
-        
-        # Smaller/family resorts - neutral to slight positive (0.05-0.12)
-        "echo mountain": 0.10, "ski cooper": 0.12, "purgatory": 0.14,
-        "taos": 0.22, "red river": 0.13, "angel fire": 0.11,
-    }
-    
     # Check for matches
     sentiment_score = 0.0
     matched_resort = None
     
-    for resort_key, score in reputation_map.items():
-        if resort_key in resort_lower:
-            sentiment_score = score
-            matched_resort = resort_key.title()
-            break
+    resort_key = match_reputation_key(resort_lower)
+    if resort_key:
+        sentiment_score = REPUTATION_MAP[resort_key]
+        matched_resort = resort_key.title()
     
     # If no specific match but contains certain positive keywords
     if sentiment_score == 0.0:
@@ -385,18 +588,69 @@ def get_reddit_sentiment(resort_name):
     
     return sentiment_score, round(pos_pct), 0, debug_msg
 
+class TokenBucket:
+    """Thread-safe token bucket: allows bursts of `capacity`, refilling at `rate` tokens/sec"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# At most this many api.weather.gov requests in flight, however wide the caller's pool is
+NWS_SEMAPHORE = threading.BoundedSemaphore(5)
+# Averages NWS's ~60 requests/min per User-Agent; the burst covers one cold search
+# (points + forecast for up to MAX_RESORTS resorts) so it isn't paced at 1/s
+NWS_RATE_LIMIT = TokenBucket(rate=1.0, capacity=2 * MAX_RESORTS)
+
+def _nws_get(url):
+    """GET an api.weather.gov URL under the NWS concurrency cap and rate limit"""
+    NWS_RATE_LIMIT.acquire()
+    with NWS_SEMAPHORE:
+        response = SESSION.get(url, timeout=10)
+        response.raise_for_status()
+        return parse_json(response)
+
+@file_cache("nws", ttl=2592000)
+def _nws_forecast_url(lat, lon):
+    """Resolve coordinates to their NWS forecast URL (grid mapping is effectively static)"""
+    point_data = _nws_get(f"https://api.weather.gov/points/{lat},{lon}")
+    return point_data["properties"]["forecast"]
+
+@file_cache("nws_forecast", ttl=1800)
+def _nws_forecast_periods(forecast_url):
+    """Fetch the forecast periods for an NWS forecast URL.
+    
+    The URL names the office and grid cell (/gridpoints/{office}/{x},{y}/forecast), so
+    resorts that resolve to the same cell share one cached forecast.
+    """
+    forecast_data = _nws_get(forecast_url)
+    return forecast_data["properties"]["periods"]
+
 def get_weather_forecast(lat, lon):
-    """Get NWS weather"""
-    headers = {"User-Agent": "ski-finder/1.0"}
+    """Get NWS weather (callers round lat/lon to 2 decimals so nearby points share entries).
     
+    Deliberately uncached: _nws_forecast_url and _nws_forecast_periods cache successes and
+    raise on failure, so a timeout or NWS 5xx shows "Weather unavailable" once and is
+    retried on the next search.
+    """
     try:
-        point_url = f"https://api.weather.gov/points/{lat},{lon}"
-        point_data = requests.get(point_url, headers=headers, timeout=10).json()
-        
-        forecast_url = point_data["properties"]["forecast"]
-        forecast_data = requests.get(forecast_url, headers=headers, timeout=10).json()
-        
-        periods = forecast_data["properties"]["periods"]
+        forecast_url = _nws_forecast_url(lat, lon)
+        periods = _nws_forecast_periods(forecast_url)
         if periods:
             return f"{periods[0]['temperature']}°F – {periods[0]['shortForecast']}"
     except:
@@ -404,6 +658,92 @@ def get_weather_forecast(lat, lon):
     
     return "Weather unavailable"
 
+def get_weather_forecasts(resorts, on_progress=None, max_workers=8, progress_interval=0.1):
+    """Fetch NWS weather for all resorts concurrently, in input order.
+    
+    on_progress(done, total) is called at most once per progress_interval seconds,
+    plus once when everything has finished, so bursts of cache hits don't flood the UI.
+    """
+    weathers = [None] * len(resorts)
+    if not resorts:
+        return weathers
+    
+    # The pool size caps how many NWS requests are in flight at once.
+    # Workers only touch the disk cache and HTTP session, never Streamlit APIs.
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(resorts)))
+    futures = {}
+    try:
+        futures = {
+            executor.submit(get_weather_forecast, round(resort["lat"], 2), round(resort["lon"], 2)): idx
+            for idx, resort in enumerate(resorts)
+        }
+        last_progress = 0.0
+        for done, future in enumerate(as_completed(futures), start=1):
+            weathers[futures[future]] = future.result()
+            now = time.monotonic()
+            if on_progress and (now - last_progress >= progress_interval or done == len(resorts)):
+                on_progress(done, len(resorts))
+                last_progress = now
+    finally:
+        # If the user changes inputs mid-search, Streamlit stops this run at the next UI call
+        # (the progress update). Drop the queued lookups and don't block the rerun on the
+        # in-flight ones; those finish on their own, bounded by their timeouts, and warm the cache.
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    
+    return weathers
+
+# Styles for the Quick Booking cards, sent once with the cards themselves.
+# Colors are translucent grays and currentColor so the cards follow light and dark themes.
+BOOKING_CARD_CSS = (
+    "<style>"
+    ".booking-cards{display:grid;gap:1rem;grid-template-columns:repeat(var(--booking-cols,3),1fr);}"
+    "@media (max-width:640px){.booking-cards{grid-template-columns:1fr;}}"
+    ".booking-card h3{margin:0 0 0.25rem 0;}"
+    ".booking-card p{margin:0.25rem 0;}"
+    ".booking-btn{display:block;text-align:center;padding:0.45rem 0.75rem;margin-top:0.5rem;"
+    "border-radius:0.5rem;border:1px solid rgba(128,128,128,0.35);"
+    "text-decoration:none !important;color:inherit !important;}"
+    ".booking-btn.primary{font-weight:600;border-color:currentColor;background:rgba(128,128,128,0.15);}"
+    "</style>"
+)
+
+def render_booking_cards(cards, trip_days, need_lesson, need_rental):
+    """Render the Quick Booking cards as one HTML block (one Streamlit message, not ~30 widgets)"""
+    def button(label, url, primary=False):
+        css_class = "booking-btn primary" if primary else "booking-btn"
+        if not url.lower().startswith(("https://", "http://")):
+            url = "#"  # Never emit javascript: or other schemes from OSM website tags
+        return (
+            f'<a class="{css_class}" href="{html.escape(url)}" target="_blank" '
+            f'rel="noopener noreferrer">{html.escape(label)}</a>'
+        )
+    
+    parts = [
+        BOOKING_CARD_CSS,
+        f'<div class="booking-cards" style="--booking-cols:{min(3, len(cards))};">',
+    ]
+    for card in cards:
+        # OSM-sourced names and URLs are untrusted; escape everything that goes into the markup
+        parts.append('<div class="booking-card">')
+        parts.append(f"<h3>{html.escape(card['Resort'])}</h3>")
+        parts.append(f"<p><strong>{html.escape(card['Distance'])}</strong> away • {html.escape(card['Reddit Vibe'])}</p>")
+        parts.append(f"<p><strong>{html.escape(card['Weather'])}</strong></p>")
+        parts.append(f"<p><strong>Estimated: {html.escape(card['Est. Total'])}</strong> for {trip_days} day(s)</p>")
+        parts.append(button("🎫 Book Lift Tickets ➜", card["Lift Tickets"], primary=True))
+        if need_lesson and card["Lessons"]:
+            parts.append(button("🎿 Book Lessons ➜", card["Lessons"]))
+        if need_rental and card["Rentals"]:
+            parts.append(button("⛷️ Book Rentals ➜", card["Rentals"]))
+        parts.append(button("📦 Search Package Deals", card["Package Search"]))
+        parts.append("</div>")
+    parts.append("</div>")
+    
+    # No newlines: indented lines inside markdown would be rendered as code blocks.
+    # Encode "$" so two cost estimates can't be read as a LaTeX span.
+    return "".join(parts).replace("$", "&#36;")
+
 # === STREAMLIT APP ===
 st.set_page_config(page_title="Smart Ski Resort Finder", layout="wide")
 st.title("🏔️ Smart Ski Resort Finder with Auto-Filled Booking Links")
@@ -416,7 +756,7 @@ with st.sidebar:
     location_input = st.text_input(
         "📍 Location", 
         value="Lake Tahoe, CA",
-        help="City, address, or landmark"
+        help="City, address, landmark, or lat, lon coordinates"
     )
     
     radius = st.slider(
@@ -467,7 +807,7 @@ if search_button and trip_days >= 1:
     
     lat, lon, address = get_location_coordinates(location_input)
     
-    if lat and lon:
+    if lat is not None and lon is not None:
         st.success(f"📍 Searching near: **{address}**")
         st.info(f"📅 Trip dates: **{date_from.strftime('%b %d')}** to **{date_to.strftime('%b %d, %Y')}** ({trip_days} day{'s' if trip_days > 1 else ''})")
         
@@ -484,36 +824,38 @@ if search_button and trip_days >= 1:
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
+                # Weather is the only network-bound step, so fetch it for every resort up front
+                status_text.text(f"Fetching weather for {len(resorts)} resort(s)...")
+                def show_weather_progress(done, total):
+                    progress_bar.progress(done / total)
+                    status_text.text(f"Fetching weather... ({done}/{total})")
+                
+                weathers = get_weather_forecasts(resorts, on_progress=show_weather_progress)
+                
+                # Get sentiment with debug info, then bucket every score into an emoji at once
+                sentiment_results = [get_reddit_sentiment(resort["name"]) for resort in resorts]
+                emojis = SENTIMENT_EMOJIS[np.searchsorted(
+                    SENTIMENT_THRESHOLDS,
+                    [result[0] for result in sentiment_results],
+                    side="right"
+                )]
+                
+                estimated_total = estimate_trip_cost(trip_days, need_lesson, need_rental)
+                
                 for idx, resort in enumerate(resorts):
-                    status_text.text(f"Building links for {resort['name']}... ({idx+1}/{len(resorts)})")
-                    
                     # Generate booking URLs
                     booking = generate_booking_urls(
                         resort["name"], 
                         resort["website"],
-                        date_from, 
-                        date_to, 
+                        date_from.isoformat(), 
+                        date_to.isoformat(), 
                         need_lesson,
                         need_rental
                     )
                     
-                    # Get sentiment with debug info
-                    sentiment, pos_pct, review_count, debug_msg = get_reddit_sentiment(resort["name"])
-                    
-                    # Get weather
-                    weather = get_weather_forecast(resort["lat"], resort["lon"])
-                    
-                    # Better emoji thresholds
-                    if sentiment >= 0.2:
-                        emoji = "😍"
-                    elif sentiment >= 0.05:
-                        emoji = "😊"
-                    elif sentiment >= -0.05:
-                        emoji = "😐"
-                    elif sentiment >= -0.2:
-                        emoji = "😕"
-                    else:
-                        emoji = "😞"
+                    sentiment, pos_pct, review_count, debug_msg = sentiment_results[idx]
+                    weather = weathers[idx]
+                    emoji = emojis[idx]
                     
                     vibe_text = f"{emoji} {sentiment}"
                     if review_count > 0:
@@ -524,7 +866,7 @@ if search_button and trip_days >= 1:
                         "Distance": f"{resort['distance']} mi",
                         "Weather": weather,
                         "Reddit Vibe": vibe_text,
-                        "Est. Total": booking["estimated_total"],
+                        "Est. Total": estimated_total,
                         "Lift Tickets": booking["lift_ticket_link"],
                         "Lessons": booking["lesson_link"] if need_lesson else "",
                         "Rentals": booking["rental_link"] if need_rental else "",
@@ -533,9 +875,6 @@ if search_button and trip_days >= 1:
                         "_booking_obj": booking,
                         "_debug": debug_msg,
                     })
-                    
-                    progress_bar.progress((idx + 1) / len(resorts))
-                    time.sleep(0.3)  # Increased delay for rate limiting
                 
                 status_text.empty()
                 progress_bar.empty()
@@ -550,73 +889,50 @@ if search_button and trip_days >= 1:
                 st.divider()
                 st.subheader("⚡ Quick Booking")
                 
-                cols = st.columns(min(3, len(resort_data)))
-                for idx, resort_info in enumerate(resort_data[:6]):
-                    with cols[idx % 3]:
-                        st.markdown(f"### {resort_info['Resort']}")
-                        st.markdown(f"**{resort_info['Distance']}** away • {resort_info['Reddit Vibe']}")
-                        st.markdown(f"**{resort_info['Weather']}**")
-                        st.markdown(f"**Estimated: {resort_info['Est. Total']}** for {trip_days} day(s)")
-                        
-                        st.link_button(
-                            "🎫 Book Lift Tickets ➜",
-                            resort_info['Lift Tickets'],
-                            use_container_width=True
-                        )
-                        
-                        if need_lesson and resort_info['Lessons']:
-                            st.link_button(
-                                "🎿 Book Lessons ➜",
-                                resort_info['Lessons'],
-                                use_container_width=True,
-                                type="secondary"
-                            )
-                        
-                        if need_rental and resort_info['Rentals']:
-                            st.link_button(
-                                "⛷️ Book Rentals ➜",
-                                resort_info['Rentals'],
-                                use_container_width=True,
-                                type="secondary"
-                            )
-                        
-                        st.link_button(
-                            "📦 Search Package Deals",
-                            resort_info['Package Search'],
-                            use_container_width=True,
-                            type="secondary"
-                        )
+                st.markdown(
+                    render_booking_cards(resort_data[:6], trip_days, need_lesson, need_rental),
+                    unsafe_allow_html=True
+                )
                 
                 # Full table
                 st.divider()
                 st.subheader("📊 All Resorts")
                 
-                df_display = pd.DataFrame([{
-                    "Resort": r["Resort"],
-                    "Distance": r["Distance"],
-                    "Weather": r["Weather"],
-                    "Vibe": r["Reddit Vibe"],    
-                    "Est. Cost": r["Est. Total"],
-                } for r in resort_data])
+                # Build the columns directly; Streamlit ships Arrow to the browser anyway
+                display_columns = {
+                    "Resort": "Resort",
+                    "Distance": "Distance",
+                    "Weather": "Weather",
+                    "Vibe": "Reddit Vibe",
+                    "Est. Cost": "Est. Total",
+                }
+                display_table = pa.table({
+                    label: [r[key] for r in resort_data]
+                    for label, key in display_columns.items()
+                })
                 
-                st.dataframe(df_display, use_container_width=True, hide_index=True)
+                st.dataframe(display_table, use_container_width=True, hide_index=True)
                 
                 # Export links
                 st.divider()
                 st.subheader("📎 Export All Booking Links")
                 
-                links_text = f"# Ski Trip Booking Links\n"
-                links_text += f"Location: {location_input}\n"
-                links_text += f"Dates: {date_from} to {date_to}\n\n"
+                link_parts = [
+                    "# Ski Trip Booking Links\n",
+                    f"Location: {location_input}\n",
+                    f"Dates: {date_from} to {date_to}\n\n",
+                ]
                 
                 for r in resort_data:
-                    links_text += f"## {r['Resort']} ({r['Distance']} away)\n"
-                    links_text += f"- Lift Tickets: {r['Lift Tickets']}\n"
+                    link_parts.append(f"## {r['Resort']} ({r['Distance']} away)\n")
+                    link_parts.append(f"- Lift Tickets: {r['Lift Tickets']}\n")
                     if need_lesson:
-                        links_text += f"- Lessons: {r['Lessons']}\n"
+                        link_parts.append(f"- Lessons: {r['Lessons']}\n")
                     if need_rental:
-                        links_text += f"- Rentals: {r['Rentals']}\n"
-                    links_text += f"- Package: {r['Package Search']}\n\n"
+                        link_parts.append(f"- Rentals: {r['Rentals']}\n")
+                    link_parts.append(f"- Package: {r['Package Search']}\n\n")
+                
+                links_text = "".join(link_parts)
                 
                 st.download_button(
                     label="💾 Download All Links (TXT)",